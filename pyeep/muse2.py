@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Iterator, Type
 
 import numpy
+import scipy.fft
 import scipy.signal
 
 from pyeep import bluetooth, dsp
@@ -71,18 +72,6 @@ class HeadGyro(Message):
             f" x={self.x}, y={self.y}, z={self.z})"
         )
 
-    # def _distance2(self) -> float:
-    #     """
-    #     Experiment with comparing messages
-    #     """
-    #     return self.x ** 2 + self.y ** 2 + self.z ** 2
-
-    # def _adistance2(self) -> float:
-    #     """
-    #     Experiment with comparing messages
-    #     """
-    #     return self.ax ** 2 + self.ay ** 2 + self.az ** 2
-
 
 class BrainWaves(Message):
     def __init__(
@@ -151,16 +140,18 @@ class ModeHeadPosition(ModeBase):
 
     def on_acc(self, data: numpy.ndarray, timestamps: list[float]):
         frames = len(timestamps)
-        for i in range(frames):
-            x = data[0, i]
-            y = data[1, i]
-            z = data[2, i]
+        # Compute the angles for the whole batch using the per-axis rows of
+        # the sample array
+        x = data[0, :frames]
+        y = data[1, :frames]
+        z = data[2, :frames]
 
-            roll = math.atan2(y, z) / math.pi * 180
-            pitch = math.atan2(-x, math.sqrt(y*y + z*z)) / math.pi * 180
+        rolls = numpy.degrees(numpy.arctan2(y, z))
+        pitches = numpy.degrees(numpy.arctan2(-x, numpy.sqrt(y*y + z*z)))
 
-            roll = self.filter_roll(roll)
-            pitch = self.filter_pitch(pitch)
+        for sample_roll, sample_pitch in zip(rolls, pitches):
+            roll = self.filter_roll(sample_roll)
+            pitch = self.filter_pitch(sample_pitch)
 
         self.muse2.send(HeadMoved(frames=frames, pitch=pitch, roll=roll))
 
@@ -173,6 +164,9 @@ class ModeBrainWaves(ModeBase):
         super().__init__(**kwargs)
         self.win_size = 256 * 2
         self.hop = 16
+        # Samples received since the last analysed window, counted so that
+        # the first window is analysed as soon as it is full
+        self.new_samples: int = self.hop - self.win_size
         self.hamming = scipy.signal.windows.hamming(self.win_size, sym=False)
         self.freqs = numpy.fft.fftfreq(self.win_size, 1 / 256)
         self.timestamps: numpy.ndarray | None = None
@@ -194,55 +188,49 @@ class ModeBrainWaves(ModeBase):
                 self.bend = idx
             elif self.gend is None and val >= 70:
                 self.gend = idx
+        # Spectrum slices for the delta, theta, alpha, beta and gamma bands
+        self.bands = (
+            slice(0, self.dend),
+            slice(self.dend, self.tend),
+            slice(self.tend, self.aend),
+            slice(self.aend, self.bend),
+            slice(self.bend, self.gend),
+        )
 
     def on_eeg(self, data: numpy.ndarray, timestamps: numpy.ndarray):
+        self.new_samples += len(timestamps)
+
         if self.timestamps is None:
             self.timestamps = timestamps
             for idx, name in enumerate(self.channels, start=1):
                 self.samples[name] = data[idx, :]
             return
 
-        self.timestamps = numpy.concatenate((self.timestamps, timestamps))
+        # Only keep the samples needed for the next window
+        self.timestamps = numpy.concatenate((self.timestamps, timestamps))[-self.win_size:]
         for idx, name in enumerate(self.channels, start=0):
             old = self.samples.get(name)
-            self.samples[name] = numpy.concatenate((old, data[idx, :]))
-
-        if len(self.timestamps) >= self.win_size:
-            window_end_time = self.timestamps[self.win_size - 1]
-
-            all_delta: float = 0.0
-            all_theta: float = 0.0
-            all_alpha: float = 0.0
-            all_beta: float = 0.0
-            all_gamma: float = 0.0
-
-            for idx, name in enumerate(self.channels, start=1):
-                arr = self.samples[name]
-
-                signal = arr[:self.win_size] * self.hamming
-                powers = abs(scipy.fft.rfft(signal))
-
-                ch_delta = numpy.mean(20 * numpy.log10(powers[0:self.dend]))
-                ch_theta = numpy.mean(20 * numpy.log10(powers[self.dend:self.tend]))
-                ch_alpha = numpy.mean(20 * numpy.log10(powers[self.tend:self.aend]))
-                ch_beta = numpy.mean(20 * numpy.log10(powers[self.aend:self.bend]))
-                ch_gamma = numpy.mean(20 * numpy.log10(powers[self.bend:self.gend]))
-
-                all_delta += ch_delta
-                all_theta += ch_theta
-                all_alpha += ch_alpha
-                all_beta += ch_beta
-                all_gamma += ch_gamma
-
-                self.samples[name] = arr[self.hop:]
-
-            self.timestamps = self.timestamps[self.hop:]
-
-            delta = all_delta / 4
-            theta = all_theta / 4
-            alpha = all_alpha / 4
-            beta = all_beta / 4
-            gamma = all_gamma / 4
+            self.samples[name] = numpy.concatenate((old, data[idx, :]))[-self.win_size:]
+
+        # Analyse a new window only once at least hop new samples arrived,
+        # keeping the leftover samples to stay on the hop cadence
+        if self.new_samples >= self.hop:
+            self.new_samples -= self.hop
+            window_end_time = self.timestamps[-1]
+
+            # Transform all channels with a single FFT call, one row per
+            # channel
+            signals = numpy.stack([self.samples[name] for name in self.channels])
+            spectrum = scipy.fft.rfft(signals * self.hamming, axis=1)
+            # Work on squared magnitudes, to avoid computing square roots:
+            # 20 * log10(|X|) == 10 * log10(|X|²)
+            powers = spectrum.real ** 2 + spectrum.imag ** 2
+
+            # All channels have the same number of bins per band, so the mean
+            # over all of them is the average of the per-channel means. Scale
+            # the mean instead of each bin.
+            delta, theta, alpha, beta, gamma = (
+                10 * numpy.mean(numpy.log10(powers[:, band])) for band in self.bands)
             # print(f"{window_end_time} {delta=:.1f} {theta=:.1f} {alpha=:.1f} {beta=:.1f} {gamma=:.1f}")
             self.muse2.send(BrainWaves(
                 timestamp=window_end_time,
@@ -254,27 +242,36 @@ class ModeBrainWaves(ModeBase):
 
 
 class GyroAxisBase:
+    # Number of samples to average to compute the gyroscope bias
+    BIAS_SAMPLES = 256
+
     def __init__(self, name: str):
         self.name = name
         self.calibration_path = Path(f".cal_gyro_{name}")
-        self.bias_samples: list[float] = []
+        # Running sum of the calibration samples seen so far
+        self.bias_sum: float = 0.0
+        self.bias_count: int = 0
         self.bias: float | None = None
         if self.calibration_path.exists():
             data = json.loads(self.calibration_path.read_text())
             self.bias = data["bias"]
 
-    def add(self, timestamp: float, sample: float):
-        if self.bias is None and len(self.bias_samples) < 256:
-            self.bias_samples.append(sample)
-        else:
-            if self.bias is None:
-                self.bias = numpy.mean(self.bias_samples)
-                self.calibration_path.write_text(json.dumps({"bias": self.bias}))
-            self.process_sample(timestamp, sample - self.bias)
-
     def add_samples(self, timestamps: list[float], samples: numpy.ndarray):
-        for ts, sample in zip(timestamps, samples):
-            self.add(ts, sample)
+        if self.bias is None:
+            # Accumulate calibration samples before processing any sample
+            count = min(len(samples), self.BIAS_SAMPLES - self.bias_count)
+            self.bias_sum += float(numpy.sum(samples[:count]))
+            self.bias_count += count
+            if self.bias_count < self.BIAS_SAMPLES:
+                return
+            self.bias = self.bias_sum / self.BIAS_SAMPLES
+            self.calibration_path.write_text(json.dumps({"bias": self.bias}))
+            timestamps = timestamps[count:]
+            samples = samples[count:]
+
+        # Remove the bias from the whole batch at once
+        for ts, sample in zip(timestamps, samples - self.bias):
+            self.process_sample(ts, sample)
 
 
 # class GyroAxisFFT(GyroAxisBase):
@@ -461,13 +458,9 @@ class Muse2InputController(InputController):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.monitor = Gtk.EntryBuffer()
-        self.last_msg_hg: HeadGyro | None = None
-        self.last_msg_hga: HeadGyro | None = None
         self.last_msg_mv: HeadMoved | None = None
 
     def on_reset(self, button):
-        self.last_msg_hg = None
-        self.last_msg_hga = None
         self.last_msg_mv = None
         self.monitor.set_text("", 0)
 
@@ -483,24 +476,6 @@ class Muse2InputController(InputController):
 
     def receive(self, msg: Message):
         match msg:
-            # case HeadGyro():
-            #     maxxed = False
-            #     if self.last_msg_hg is None or self.last_msg_hg._distance2() < msg._distance2():
-            #         self.last_msg_hg = msg
-            #         maxxed = True
-            #     if self.last_msg_hga is None or self.last_msg_hga._adistance2() < msg._adistance2():
-            #         self.last_msg_hga = msg
-            #         maxxed = True
-            #     if maxxed:
-            #         text = ""
-            #         if (m := self.last_msg_hg):
-            #             text += f"x={m.x:.2f} y={m.y:.2f} z={m.z:.2f}"
-            #         if (m := self.last_msg_hga):
-            #             if text:
-            #                 text += " "
-            #             text += f"ax={m.ax:.2f} ay={m.ay:.2f} az={m.az:.2f}"
-            #         self.monitor.set_text(text, len(text))
-
             case HeadMoved():
                 if self.last_msg_mv is None or self.last_msg_mv._distance2() < msg._distance2():
                     self.last_msg_mv = msg
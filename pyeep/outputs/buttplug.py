@@ -6,7 +6,7 @@ from typing import Any, Type
 import buttplug
 import pyeep.outputs
 from pyeep.component.aio import AIOComponent
-from pyeep.component.base import export, check_hub
+from pyeep.component.base import export
 from pyeep.component.controller import ControllerWidget
 from pyeep.messages.message import Message
 from pyeep.messages.component import DeviceScanRequest, Shutdown
@@ -16,18 +16,11 @@ from .power import PowerOutput, PowerOutputController
 from pyeep.gtk import GLib, Gtk
 
 
-class SetPower(Message):
+class SendPower(Message):
     """
-    Internal use only
+    Internal use only: send the latest power given to set_power
     """
 
-    def __init__(self, *, power: float, **kwargs):
-        super().__init__(**kwargs)
-        self.power = power
-
-    def __str__(self) -> str:
-        return super().__str__() + f"(power={self.power})"
-
 
 class SetPosition(Message):
     """
@@ -52,6 +45,12 @@ class Actuator(PowerOutput, AIOComponent):
         kwargs.setdefault("rate", 20)
         super().__init__(**kwargs)
         self.actuator = actuator
+        # Power changes are coalesced: only the latest value is sent, at most
+        # rate times a second
+        self.pending_power: float = 0.0
+        self.power_queued: bool = False
+        # Last power sent to the device
+        self.sent_power: float | None = None
 
     @property
     def description(self) -> str:
@@ -62,16 +61,44 @@ class Actuator(PowerOutput, AIOComponent):
 
     @export
     def set_power(self, power: float):
-        self.receive(SetPower(power=power))
+        self.pending_power = power
+        if not self.power_queued:
+            self.power_queued = True
+            self.receive(SendPower())
+
+    def receive(self, msg: Message):
+        # Only queue what run() handles, to avoid waking up for every
+        # message going through the hub
+        match msg:
+            case Shutdown() | SendPower():
+                super().receive(msg)
 
     async def run(self):
+        next_message = self.next_message
         while True:
-            msg = await self.next_message()
+            msg = await next_message()
             match msg:
                 case Shutdown():
                     break
-                case SetPower():
-                    await self.actuator.command(msg.power)
+                case SendPower():
+                    # Clear the flag before reading the value, so that a
+                    # concurrent set_power is never lost
+                    self.power_queued = False
+                    power = self.pending_power
+                    if power == self.sent_power:
+                        continue
+                    await self.actuator.command(power)
+                    self.sent_power = power
+                    await asyncio.sleep(1 / self.rate)
+
+
+def _position_adjustment(value: float) -> Gtk.Adjustment:
+    """
+    Create an adjustment for a linear actuator position, in percent
+    """
+    return Gtk.Adjustment(
+        value=value, lower=0, upper=100, step_increment=5, page_increment=10, page_size=0
+    )
 
 
 class LinearOutputController(OutputController):
@@ -83,14 +110,10 @@ class LinearOutputController(OutputController):
         super().__init__(**kwargs)
         self.timeout: int | None = None
 
-        self.position_min = Gtk.Adjustment(
-            value=0, lower=0, upper=100, step_increment=5, page_increment=10, page_size=0
-        )
+        self.position_min = _position_adjustment(0)
         # self.position_min.connect("value_changed", self.on_position_min)
 
-        self.position_max = Gtk.Adjustment(
-            value=100, lower=0, upper=100, step_increment=5, page_increment=10, page_size=0
-        )
+        self.position_max = _position_adjustment(100)
         # self.position_max.connect("value_changed", self.on_position_max)
 
         self.movement_time = Gtk.Adjustment(
@@ -102,18 +125,17 @@ class LinearOutputController(OutputController):
 
         self.timeout = GLib.timeout_add(self.movement_time.get_value(), self.select_next_target)
 
-    @check_hub
     def select_next_target(self):
+        # Read the movement time once and use it for both the movement and
+        # the next timer
         time_ms = int(self.movement_time.get_value())
         if self.forwards:
             target = self.position_max.get_value() / 100.0
-            self.output.set_position(time_ms, target)
-            self.forwards = False
         else:
             target = self.position_min.get_value() / 100.0
-            self.output.set_position(time_ms, target)
-            self.forwards = True
-        self.timeout = GLib.timeout_add(self.movement_time.get_value(), self.select_next_target)
+        self.output.set_position(time_ms, target)
+        self.forwards = not self.forwards
+        self.timeout = GLib.timeout_add(time_ms, self.select_next_target)
         return False
 
     def build(self) -> ControllerWidget:
@@ -167,9 +189,15 @@ class LinearActuator(Output, AIOComponent):
     def set_position(self, time_ms: int, position: float):
         self.receive(SetPosition(time_ms=time_ms, position=position))
 
+    def receive(self, msg: Message):
+        match msg:
+            case Shutdown() | SetPosition():
+                super().receive(msg)
+
     async def run(self):
+        next_message = self.next_message
         while True:
-            msg = await self.next_message()
+            msg = await next_message()
             match msg:
                 case Shutdown():
                     break
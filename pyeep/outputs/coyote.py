@@ -201,10 +201,10 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
         """
         Parse pattern data and return Az, Ay, Ax byte values
         """
-        print("PPAT", value)
+        self.logger.debug("parse pattern %r", value)
         # PWM_A34 A channel waveform data 23-20bit(Reserved) 19-15bit(Az) 14-5bit(Ay) 4-0bit(Ax)
         pattern_uint = (value[2] << 16) + (value[1] << 8) + value[0]
-        print(f"PPAT UINT {pattern_uint} {pattern_uint:x} {pattern_uint:b}")
+        self.logger.debug("parse pattern uint %d %x", pattern_uint, pattern_uint)
         Ax = pattern_uint & 0x1f  # 5 bits
         Ay = (pattern_uint >> 5) & 0x3ff  # 10 bits
         Az = (pattern_uint >> 15) & 0x1f  # 5 bits
@@ -212,7 +212,7 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
 
     async def on_connect(self):
         await super().on_connect()
-        print("CONNECT")
+        self.logger.debug("connected")
 
         service = self.client.services.get_service(self.COYOTE_SERVICE)
         self.ch_config = self.client.services.get_characteristic(self.CONFIG_CHARACTERISTIC)
@@ -222,43 +222,40 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
 
         char1 = await self.client.read_gatt_char(self.ch_config)
         self.power_step, self.power_max = struct.unpack("<BH", char1)
-        print("POWER CONFIG", self.power_max, self.power_step)
+        self.logger.debug("power config: max=%d step=%d", self.power_max, self.power_step)
 
         # PWM_AB2 AB two-channel intensity 23-22bit(Reserved) 21-11bit(B
         # channel actual intensity) 10-0bit(A channel actual intensity)
         power_bytes = await self.client.read_gatt_char(self.ch_power)
         power_a, power_b = self._parse_channel_power(power_bytes)
-        print("CHANNEL POWER", power_a, power_b)
+        self.logger.debug("channel power: a=%d b=%d", power_a, power_b)
 
         # Subscribe to power notifications
         await self.client.start_notify(self.ch_power, self.on_power_changed)
-        print("SUBSCRIBED TO POWER")
+        self.logger.debug("subscribed to power notifications")
 
         # Read current patterns
         pattern_a_bytes = await self.client.read_gatt_char(self.ch_pattern_a)
         self.Ax, self.Ay, self.Az = self._parse_pattern(pattern_a_bytes)
         pattern_b_bytes = await self.client.read_gatt_char(self.ch_pattern_b)
         self.Bx, self.By, self.Bz = self._parse_pattern(pattern_a_bytes)
-        print("PATTERN B", self._parse_pattern(pattern_b_bytes))
+        self.logger.debug("pattern B: %r", self._parse_pattern(pattern_b_bytes))
 
         # Subscribe to battery notifications
         battery_bytes = await self.client.read_gatt_char(self.ch_battery)
-        print("BATTERY%", battery_bytes[0])
+        self.logger.debug("battery: %d%%", battery_bytes[0])
 
         await self.client.start_notify(self.ch_battery, self.on_battery_changed)
-        print("SUBSCRIBED TO BATTERY")
+        self.logger.debug("subscribed to battery notifications")
 
         # TODO: set up a 100ms timer to drive the waveform
 
     def on_power_changed(self, characteristic: bleak.backend.characteristic.BleakGATTCharacteristic, data: bytearray):
-        print("OPC")
         self.device_power_a, self.device_power_b = self._parse_channel_power(data)
-        print("POWER UPDATE", self.device_power_a, self.device_power_b)
+        self.logger.debug("power update: a=%d b=%d", self.device_power_a, self.device_power_b)
 
     def on_battery_changed(self, characteristic: bleak.backend.characteristic.BleakGATTCharacteristic, data: bytearray):
-        print("OBC")
-
-        print("BATTERY UPDATE", data[0])
+        self.logger.debug("battery update: %d%%", data[0])
 
     async def _timer_task(self):
         while True:
@@ -269,8 +266,6 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
             )
 
     async def _on_timer(self):
-        print("TIMER")
-
         if self.device_power_a == self.power_a and self.device_power_b == self.power_b:
             return
 
@@ -281,9 +276,9 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
         coyote_power_b = self.power_max * self.power_b
         coyote_power_a = math.ceil(coyote_power_a / self.power_step) * self.power_step
         coyote_power_b = math.ceil(coyote_power_b / self.power_step) * self.power_step
-        print("normalised", coyote_power_a, coyote_power_b)
+        self.logger.debug("normalised power: a=%d b=%d", coyote_power_a, coyote_power_b)
         encoded = self._encode_channel_power(coyote_power_a, coyote_power_b)
-        print("encoded", encoded)
+        self.logger.debug("encoded power: %r", encoded)
 
         await self.client.write_gatt_char(self.ch_power, encoded)
 
@@ -296,8 +291,6 @@ class Coyote(PowerOutput, bluetooth.BluetoothComponent):
         if self.power_max is None:
             return
 
-        print("set power", power)
-
         self.power_a = power
         self.power_b = power
 
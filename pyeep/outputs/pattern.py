@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Type
+import functools
+from typing import Any, Callable, NamedTuple, Type
 
 import jack
 import numpy
@@ -12,12 +13,108 @@ from pyeep.component.jack import JackComponent
 from pyeep.gtk import Gtk, Gio, GLib, GObject
 from pyeep.messages.message import Message
 from pyeep.messages.component import Shutdown
-from pyeep.synth import Wave, SineWave, SawWave
+from pyeep.synth import Wave, SawWave
 from pyeep.outputs.base import BaseOutputController
 
 from .power import PowerOutput
 
 
+def guarded(func: Callable) -> Callable:
+    """
+    Decorate a GTK callback method to log exceptions instead of letting them
+    propagate into GTK
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        except Exception:
+            self.logger.exception("%s failed", func.__name__)
+            return None
+    return wrapper
+
+
+class TableSineWave:
+    """
+    Sine wave generated by linear interpolation on a lookup table.
+
+    This is cheaper than calling numpy.sin on every sample, and the
+    interpolation error is well below audible levels.
+    """
+    TABLE_SIZE = 4096
+    # The extra entry at the end avoids wrapping the index when interpolating
+    TABLE = numpy.sin(
+            numpy.arange(TABLE_SIZE + 1) * (2 * numpy.pi / TABLE_SIZE)).astype(numpy.float32)
+    # Values following each table entry, to look them up without computing idx + 1
+    TABLE_NEXT = TABLE[1:]
+
+    def __init__(self, rate: int, frames: int = 0):
+        self.rate = rate
+        # Current phase, in table positions
+        self.phase: float = 0.0
+        self.reserve(frames)
+
+    def reserve(self, frames: int):
+        """
+        Allocate work buffers for generating up to the given number of frames,
+        to avoid allocating memory while generating the wave
+        """
+        self.ramp = numpy.arange(frames, dtype=numpy.float64)
+        self.pos = numpy.empty(frames, dtype=numpy.float64)
+        self.idx = numpy.empty(frames, dtype=numpy.intp)
+        self.low = numpy.empty(frames, dtype=numpy.float32)
+        self.high = numpy.empty(frames, dtype=numpy.float32)
+
+    def wave(self, array: numpy.ndarray, freq: float):
+        """
+        Fill array with the next samples of a sine wave of the given frequency
+        """
+        frames = len(array)
+        if frames > len(self.ramp):
+            self.reserve(frames)
+        step = freq * self.TABLE_SIZE / self.rate
+
+        pos = self.pos[:frames]
+        numpy.multiply(self.ramp[:frames], step, out=pos)
+        pos += self.phase
+        numpy.remainder(pos, self.TABLE_SIZE, out=pos)
+        self.phase = (self.phase + frames * step) % self.TABLE_SIZE
+
+        idx = self.idx[:frames]
+        numpy.copyto(idx, pos, casting="unsafe")
+        # Keep only the fractional part of the position
+        pos -= idx
+
+        low = self.low[:frames]
+        high = self.high[:frames]
+        numpy.take(self.TABLE, idx, out=low)
+        numpy.take(self.TABLE_NEXT, idx, out=high)
+        high -= low
+        high *= pos
+        numpy.add(low, high, out=array)
+
+    def synth(self, array: numpy.ndarray, freq: float, envelope: numpy.ndarray):
+        """
+        Fill array with the next samples of a sine wave of the given frequency,
+        modulated by envelope
+        """
+        self.wave(array, freq)
+        array *= envelope
+
+
+class ChannelParams(NamedTuple):
+    """
+    Synthesis parameters of a channel.
+
+    They are replaced as a whole on changes, so that the JACK process callback
+    always sees a consistent set
+    """
+    osc_freq: float
+    lfo_freq: float
+    min_level: float
+    max_level: float
+
+
 class Channel:
     def __init__(
             self, *,
@@ -35,37 +132,66 @@ class Channel:
 
         self.volume = volume
 
-        self.osc: Wave | None = None
-        self.osc_freq = osc_freq
-
-        self.lfo: Wave | None = None
-        self.lfo_freq = lfo_freq
+        self.osc: TableSineWave | None = None
+        self.lfo: Wave | TableSineWave | None = None
         self.lfo_shape = lfo_shape
 
-        self.min_level = min_level
-        self.max_level = max_level
+        self.params = ChannelParams(
+            osc_freq=osc_freq,
+            lfo_freq=lfo_freq,
+            min_level=min_level,
+            max_level=max_level)
+
+        # Preallocated envelope buffer, to avoid allocating memory in the
+        # JACK process callback
+        self.envelope = numpy.zeros(0, dtype=numpy.float32)
+
+    def reserve(self, frames: int):
+        """
+        Preallocate buffers to synthesize up to the given number of frames
+        """
+        self.envelope = numpy.zeros(frames, dtype=numpy.float32)
+        if self.osc is not None:
+            self.osc.reserve(frames)
+        if isinstance(self.lfo, TableSineWave):
+            self.lfo.reserve(frames)
 
     def set_rate(self, rate: int):
         self.rate = rate
-        self.osc = SineWave(self.rate)
+        self.osc = TableSineWave(self.rate, len(self.envelope))
         self.setup()
 
-    def make_envelope(self, frames: int) -> numpy.ndarray:
-        lfo = numpy.zeros(frames)
-        self.lfo.wave(lfo, self.lfo_freq)
+    def make_envelope(self, frames: int, params: ChannelParams) -> numpy.ndarray:
+        if frames > len(self.envelope):
+            self.reserve(frames)
+        # JACK buffers are float32: avoid computing in float64 and converting
+        envelope = self.envelope[:frames]
 
-        span = self.max_level - self.min_level
-        return (self.min_level + span / 2 + lfo * span / 2) * self.volume
+        if params.min_level == params.max_level:
+            # No modulation: skip computing the LFO
+            envelope.fill(params.min_level * self.volume)
+            return envelope
 
-    def synth(self, frames: int, array: numpy.ndarray):
-        array.fill(0)
+        envelope.fill(0)
+        self.lfo.wave(envelope, params.lfo_freq)
 
+        # Scale the LFO in place into [min_level, max_level] * volume, without
+        # allocating temporaries
+        half_span = (params.max_level - params.min_level) / 2
+        envelope *= half_span * self.volume
+        envelope += (params.min_level + half_span) * self.volume
+        return envelope
+
+    def synth(self, frames: int, array: numpy.ndarray):
         if self.volume == 0.0 or self.osc is None or self.lfo is None:
             # Skip computing waveforms if volume is 0
+            array.fill(0)
             return
 
-        envelope = self.make_envelope(frames)
-        self.osc.synth(array, self.osc_freq, envelope)
+        # Read the parameters once, in case setup() replaces them meanwhile
+        params = self.params
+        envelope = self.make_envelope(frames, params)
+        self.osc.synth(array, params.osc_freq, envelope)
 
     def setup(
             self, *,
@@ -74,14 +200,12 @@ class Channel:
             lfo_shape: str | None = None,
             min_level: float | None = None,
             max_level: float | None = None):
-        if freq is not None:
-            self.osc_freq = freq
-        if lfo_freq is not None:
-            self.lfo_freq = lfo_freq
-        if min_level is not None:
-            self.min_level = min_level
-        if max_level is not None:
-            self.max_level = max_level
+        params = self.params
+        self.params = ChannelParams(
+            osc_freq=params.osc_freq if freq is None else freq,
+            lfo_freq=params.lfo_freq if lfo_freq is None else lfo_freq,
+            min_level=params.min_level if min_level is None else min_level,
+            max_level=params.max_level if max_level is None else max_level)
 
         # Hack to use setup at set_rate time to initialize the right LFO
         # oscillators
@@ -89,11 +213,14 @@ class Channel:
             lfo_shape = self.lfo_shape
 
         if lfo_shape is not None:
-            if self.lfo is None or self.lfo_shape != lfo_shape:
+            if self.rate is None:
+                # Oscillators are created when set_rate calls setup
+                self.lfo_shape = lfo_shape
+            elif self.lfo is None or self.lfo_shape != lfo_shape:
                 self.lfo_shape = lfo_shape
                 match lfo_shape:
                     case "sine":
-                        self.lfo = SineWave(self.rate)
+                        self.lfo = TableSineWave(self.rate, len(self.envelope))
                     case "saw":
                         self.lfo = SawWave(self.rate)
 
@@ -113,6 +240,8 @@ class PatternPlayer(PowerOutput, JackComponent, AIOComponent):
         self.set_rate(jack_client.samplerate)
         self.left.set_rate(self.rate)
         self.right.set_rate(self.rate)
+        self.left.reserve(jack_client.blocksize)
+        self.right.reserve(jack_client.blocksize)
         self.outport_l = self.jack_client.outports.register('pattern_L')
         # print(self.jack_client.inports)
         # print(self.jack_client.outports)
@@ -136,6 +265,13 @@ class PatternPlayer(PowerOutput, JackComponent, AIOComponent):
         self.left.setup(**left)
         self.right.setup(**right)
 
+    def receive(self, msg: Message):
+        # run() only handles Shutdown: do not wake it up for every message
+        # going through the hub
+        match msg:
+            case Shutdown():
+                super().receive(msg)
+
     async def run(self) -> None:
         while True:
             match await self.next_message():
@@ -155,7 +291,7 @@ class ChannelController(GObject.Object):
                 step_increment=10,
                 page_increment=100,
                 page_size=0)
-        self.freq.connect("value_changed", self.on_adjust_changed)
+        self.freq.connect("value_changed", self.on_adjust_changed, "freq")
 
         self.lfo_freq = Gtk.Adjustment(
                 value=1.0,
@@ -164,7 +300,7 @@ class ChannelController(GObject.Object):
                 step_increment=0.1,
                 page_increment=1,
                 page_size=0)
-        self.lfo_freq.connect("value_changed", self.on_adjust_changed)
+        self.lfo_freq.connect("value_changed", self.on_adjust_changed, "lfo_freq")
 
         lfo_shapes = Gtk.ListStore(str, str)
         lfo_shapes.append(["sine", "Sine"])
@@ -185,7 +321,7 @@ class ChannelController(GObject.Object):
                 step_increment=0.05,
                 page_increment=0.1,
                 page_size=0)
-        self.min_level.connect("value_changed", self.on_adjust_changed)
+        self.min_level.connect("value_changed", self.on_adjust_changed, "min_level")
 
         self.max_level = Gtk.Adjustment(
                 value=1.0,
@@ -194,16 +330,28 @@ class ChannelController(GObject.Object):
                 step_increment=0.01,
                 page_increment=0.1,
                 page_size=0)
-        self.max_level.connect("value_changed", self.on_adjust_changed)
+        self.max_level.connect("value_changed", self.on_adjust_changed, "max_level")
+
+        # Current parameter values, kept up to date by the change handlers to
+        # avoid querying all widgets at each apply
+        self.values: dict[str, Any] = {
+            "freq": self.freq.get_value(),
+            "lfo_freq": self.lfo_freq.get_value(),
+            "lfo_shape": self._get_lfo_shape(),
+            "min_level": self.min_level.get_value(),
+            "max_level": self.max_level.get_value(),
+        }
 
     @GObject.Signal
     def changed(self):
         pass
 
-    def on_adjust_changed(self, adj: Gtk.Adjustment):
+    def on_adjust_changed(self, adj: Gtk.Adjustment, name: str):
+        self.values[name] = adj.get_value()
         self.emit("changed")
 
     def on_lfo_shape_changed(self, combo: Gtk.ComboBox):
+        self.values["lfo_shape"] = self._get_lfo_shape()
         self.emit("changed")
 
     def _get_lfo_shape(self) -> str | None:
@@ -215,19 +363,30 @@ class ChannelController(GObject.Object):
         return mode
 
     def get_config(self) -> dict[str, Any]:
-        res: dict[str, Any] = {}
-        for param in ("freq", "lfo_freq", "min_level", "max_level"):
-            res[param] = getattr(self, param).get_value()
-        res["lfo_shape"] = self._get_lfo_shape()
-        return res
+        return dict(self.values)
 
     def load_config(self, config: dict[str, Any]):
-        for param in ("freq", "lfo_freq", "min_level", "max_level"):
-            if (val := config.get(param)) is not None:
-                getattr(self, param).set_value(val)
+        # Set all values with change handlers blocked, and notify the change
+        # only once at the end, so that listeners never see a half-loaded
+        # configuration
+        for name, adj in (
+                ("freq", self.freq),
+                ("lfo_freq", self.lfo_freq),
+                ("min_level", self.min_level),
+                ("max_level", self.max_level)):
+            if (val := config.get(name)) is not None:
+                adj.handler_block_by_func(self.on_adjust_changed)
+                adj.set_value(val)
+                adj.handler_unblock_by_func(self.on_adjust_changed)
+                self.values[name] = adj.get_value()
 
         if (val := config.get("lfo_shape")) is not None:
+            self.lfo_shape.handler_block_by_func(self.on_lfo_shape_changed)
             self.lfo_shape.set_active_id(val)
+            self.lfo_shape.handler_unblock_by_func(self.on_lfo_shape_changed)
+            self.values["lfo_shape"] = self._get_lfo_shape()
+
+        self.emit("changed")
 
     def get_setup_kwargs(self) -> dict[str, Any]:
         return self.get_config()
@@ -263,24 +422,48 @@ class PatternOutputController(BaseOutputController):
         self.left.connect("changed", self.on_channel_changed)
         self.right = ChannelController(channel_name="right")
         self.right.connect("changed", self.on_channel_changed)
+        self.actions = Gio.SimpleActionGroup()
         self.auto_apply = Gio.SimpleAction.new_stateful(
-                name=self.name.replace("_", "-") + "-auto-apply",
+                name="auto-apply",
                 parameter_type=None,
                 state=GLib.Variant.new_boolean(False))
-        self.hub.app.gtk_app.add_action(self.auto_apply)
+        self.auto_apply.connect("notify::state", self.on_auto_apply_state)
+        self.actions.add_action(self.auto_apply)
+        self.auto_apply_enabled = False
+        # Timeout used to coalesce bursts of changes while auto applying
+        self.auto_apply_timeout: int | None = None
 
         # TODO: animated ramp targets for the various parameters
 
+    @guarded
+    def on_auto_apply_state(self, action, pspec):
+        # Mirror the action state, to avoid querying it on every change
+        self.auto_apply_enabled = action.get_state().get_boolean()
+        if not self.auto_apply_enabled and self.auto_apply_timeout is not None:
+            GLib.source_remove(self.auto_apply_timeout)
+            self.auto_apply_timeout = None
+
+    @guarded
     def on_apply(self, button):
         self.output.setup(
             left=self.left.get_setup_kwargs(),
             right=self.right.get_setup_kwargs(),
         )
 
+    @guarded
     def on_channel_changed(self, channel: ChannelController):
-        if not self.auto_apply.get_state().get_boolean():
+        if not self.auto_apply_enabled:
             return
+        # Dragging a slider changes values far more often than the player
+        # needs: apply at most once per frame
+        if self.auto_apply_timeout is None:
+            self.auto_apply_timeout = GLib.timeout_add(16, self.on_auto_apply_timeout)
+
+    @guarded
+    def on_auto_apply_timeout(self):
+        self.auto_apply_timeout = None
         self.on_apply(None)
+        return False
 
     def build(self) -> ControllerWidget:
         cw = super().build()
@@ -302,6 +485,7 @@ class PatternOutputController(BaseOutputController):
 
         buttons = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         buttons.set_hexpand(True)
+        buttons.insert_action_group("pattern", self.actions)
         cw.box.append(buttons)
 
         apply = Gtk.Button(label="Apply")
@@ -309,7 +493,7 @@ class PatternOutputController(BaseOutputController):
         buttons.append(apply)
 
         autoapply = Gtk.ToggleButton(label="Auto apply")
-        autoapply.set_action_name("app." + self.auto_apply.get_name())
+        autoapply.set_action_name("pattern.auto-apply")
         buttons.append(autoapply)
 
         return cw
@@ -330,9 +514,3 @@ class PatternOutputController(BaseOutputController):
         res["left"] = self.left.get_config()
         res["right"] = self.right.get_config()
         return res
-
-    @check_hub
-    def receive(self, msg: Message):
-        match msg:
-            case _:
-                super().receive(msg)
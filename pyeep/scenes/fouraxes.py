@@ -24,6 +24,12 @@ class FourAxes(Scene):
             "a": PowerControl(self, "a", group=4),
         }
 
+        # Map shortcut commands to the axis they control and the power change
+        self.shortcuts: dict[str, tuple[PowerControl, float]] = {}
+        for name, axis in self.axes.items():
+            self.shortcuts["+" + name.upper()] = (axis, 0.05)
+            self.shortcuts["-" + name.upper()] = (axis, -0.05)
+
         self.ui_grid_columns = 3
 
     @check_hub
@@ -38,23 +44,9 @@ class FourAxes(Scene):
             return
         match msg:
             case Shortcut():
-                match msg.command:
-                    case "+X":
-                        self.axes["x"].increment_power(0.05)
-                    case "-X":
-                        self.axes["x"].increment_power(-0.05)
-                    case "+Y":
-                        self.axes["y"].increment_power(0.05)
-                    case "-Y":
-                        self.axes["y"].increment_power(-0.05)
-                    case "+Z":
-                        self.axes["z"].increment_power(0.05)
-                    case "-Z":
-                        self.axes["z"].increment_power(-0.05)
-                    case "+A":
-                        self.axes["a"].increment_power(0.05)
-                    case "-A":
-                        self.axes["a"].increment_power(-0.05)
+                if (action := self.shortcuts.get(msg.command)) is not None:
+                    axis, delta = action
+                    axis.increment_power(delta)
 
     def build(self) -> Gtk.Expander:
         expander = super().build()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import inspect
-from typing import Iterator
+from typing import Any, Callable, Iterator
 
 import numpy
 
@@ -28,6 +28,10 @@ class HeadPosition(SingleGroupPowerScene):
 
         self.control_angle = Gtk.Adjustment(
                 value=60, upper=180, step_increment=5, page_increment=10)
+        # Shadow of the control angle value, to avoid querying the adjustment
+        # for every message
+        self.control_angle_value: float = self.control_angle.get_value()
+        self.control_angle.connect("value-changed", self.on_control_angle_changed)
 
         # TODO: replace with a Gtk backend for mode selection
         self.mode: str = "center_zero"
@@ -75,11 +79,12 @@ class HeadPosition(SingleGroupPowerScene):
 
         return expander
 
-    @check_hub
+    def on_control_angle_changed(self, adjustment):
+        self.control_angle_value = adjustment.get_value()
+
     def set_mode(self, button, mode: str):
         self.mode = mode
 
-    @check_hub
     def set_center(self, button):
         self.reference_pitch = None
         self.reference_roll = None
@@ -97,7 +102,7 @@ class HeadPosition(SingleGroupPowerScene):
 
                     # roll_angle = self.reference_roll - roll
                     pitch_angle = self.reference_pitch - msg.pitch
-                    control_angle = self.control_angle.get_value()
+                    control_angle = self.control_angle_value
                     match self.mode:
                         case "center_zero":
                             power = numpy.clip(abs(pitch_angle) * 2 / control_angle, 0, 1)
@@ -121,29 +126,74 @@ class Consent(SingleGroupPowerScene):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.timeout: int | None = None
+        # Power increments from gestures are summed and applied once per main
+        # loop iteration
+        self.pending_increment: float = 0.0
+        self.increment_flush: int | None = None
 
         self.streak_start: HeadYesNo | None = None
         self.streak_last: HeadYesNo | None = None
 
+        # Keep our actions in a group scoped to our widgets, instead of
+        # adding them to the application
+        self.actions = Gio.SimpleActionGroup()
+
         self.instant_no = Gio.SimpleAction.new_stateful(
-                name=self.name.replace("_", "-") + "-instant_no",
+                name="instant-no",
                 parameter_type=None,
                 state=GLib.Variant.new_boolean(False))
-        self.hub.app.gtk_app.add_action(self.instant_no)
+        self.instant_no.connect("notify::state", self.on_instant_no_state)
+        self.actions.add_action(self.instant_no)
+        self.instant_no_enabled = False
 
         self.decay = Gio.SimpleAction.new_stateful(
-                name=self.name.replace("_", "-") + "-decay",
+                name="decay",
                 parameter_type=None,
                 state=GLib.Variant.new_boolean(True))
-        self.hub.app.gtk_app.add_action(self.decay)
+        self.decay.connect("notify::state", self.on_decay_state)
+        self.actions.add_action(self.decay)
+        self.decay_enabled = True
+
+    def on_instant_no_state(self, action, pspec):
+        # Mirror the action state, to avoid querying it for every message
+        self.instant_no_enabled = action.get_state().get_boolean()
+
+    def on_decay_state(self, action, pspec):
+        self.decay_enabled = action.get_state().get_boolean()
 
     @check_hub
     def set_active(self, value: bool):
         if not value and self.timeout is not None:
             GLib.source_remove(self.timeout)
             self.timeout = None
+        if not value:
+            self._cancel_increment()
         super().set_active(value)
 
+    def _queue_increment(self, value: float):
+        # Power is clamped at each increment: only coalesce increments in the
+        # same direction, so that the result does not change
+        if self.pending_increment * value < 0:
+            self.increment_power(self.pending_increment)
+            self.pending_increment = value
+        else:
+            self.pending_increment += value
+        if self.increment_flush is None:
+            self.increment_flush = GLib.idle_add(self._flush_increment)
+
+    def _cancel_increment(self):
+        if self.increment_flush is not None:
+            GLib.source_remove(self.increment_flush)
+            self.increment_flush = None
+        self.pending_increment = 0.0
+
+    def _flush_increment(self):
+        self.increment_flush = None
+        value = self.pending_increment
+        self.pending_increment = 0.0
+        self.increment_power(value)
+        return False
+
     def _tick(self):
         # Slow decay
         self.increment_power(-0.02)
@@ -154,7 +204,7 @@ class Consent(SingleGroupPowerScene):
             GLib.source_remove(self.timeout)
             self.timeout = None
 
-        if not self.decay.get_state().get_boolean():
+        if not self.decay_enabled:
             return
 
         self.timeout = GLib.timeout_add(500, self._tick)
@@ -162,14 +212,15 @@ class Consent(SingleGroupPowerScene):
     def build(self) -> Gtk.Expander:
         expander = super().build()
         grid = expander.get_child()
+        grid.insert_action_group("consent", self.actions)
         row = grid.max_row
 
         decay = Gtk.ToggleButton(label="Decay")
-        decay.set_action_name("app." + self.decay.get_name())
+        decay.set_action_name("consent.decay")
         grid.attach(decay, 0, row, 1, 1)
 
         instant_no = Gtk.ToggleButton(label="Instant NO")
-        instant_no.set_action_name("app." + self.instant_no.get_name())
+        instant_no.set_action_name("consent.instant-no")
         grid.attach(instant_no, 1, row, 1, 1)
 
         return expander
@@ -181,7 +232,7 @@ class Consent(SingleGroupPowerScene):
 
         match msg:
             case HeadYesNo():
-                instant_no = self.instant_no.get_state().get_boolean()
+                instant_no = self.instant_no_enabled
 
                 if msg.intensity < 0.1:
                     return
@@ -210,17 +261,20 @@ class Consent(SingleGroupPowerScene):
                 if value > 0.001:
                     match msg.gesture:
                         case "meh":
-                            self.increment_power(-value)
+                            self._queue_increment(-value)
                             self._reset_timeout()
                         case "no":
                             if instant_no:
-                                value = 1.0
-                            self.increment_power(-value)
+                                # Stop right away, discarding any increment still pending
+                                self._cancel_increment()
+                                self.increment_power(-1.0)
+                            else:
+                                self._queue_increment(-value)
                             self._reset_timeout()
                         case "yes":
                             if in_streak:
                                 value *= in_streak + 1
-                            self.increment_power(value)
+                            self._queue_increment(value)
                             self._reset_timeout()
 
 
@@ -239,6 +293,9 @@ class Dance(ModeBase):
     """
     Pitch/roll
     """
+    # Colors are sent through ColorDance.send_color, which skips repeats
+    scene: ColorDance
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.input_rate = 52
@@ -246,99 +303,106 @@ class Dance(ModeBase):
         self.filter_green = dsp.Butterworth(rate=self.input_rate, cutoff=10)
         self.filter_blue = dsp.Butterworth(rate=self.input_rate, cutoff=10)
         self.last_bw_ts: float | None = None
+        # Message handlers, looked up by exact message type
+        self.handlers: dict[type[Message], Callable[[Any], None]] = {
+            HeadYesNo: self.on_head_yes_no,
+            HeadMoved: self.on_head_moved,
+            HeadGyro: self.on_head_gyro,
+            BrainWaves: self.on_brain_waves,
+        }
 
     def on_message(self, msg: Message):
-        match msg:
-            case HeadYesNo():
-                value = msg.intensity ** 2
-
-                red = 0
-                green = 0
-                blue = 0
-
-                match msg.gesture:
-                    case "meh":
-                        # Meh
-                        red = value
-                        green = value / 3
-                    case "yes":
-                        # Yes
-                        green = value
-                    case "no":
-                        # No
-                        red = value
-
-                red = self.filter_red(red)
-                green = self.filter_green(green)
-                blue = self.filter_blue(blue)
-
-                color = Color(
-                    red=numpy.clip(red, 0, 1),
-                    green=numpy.clip(green, 0, 1),
-                    blue=numpy.clip(blue, 0, 1),
-                )
-
-                self.scene.send(SetGroupColor(
-                    group=self.scene.get_group(),
-                    color=color))
-
-            case HeadMoved():
-                def norm(val: float, min_angle=0, max_angle=80) -> float:
-                    return ((abs(val) - min_angle) / (max_angle - min_angle)) ** 2
-
-                blue = self.filter_blue(norm(msg.pitch, max_angle=40))
-                green = self.filter_green(norm(msg.roll, max_angle=40))
-                red = self.filter_red(1 - max(blue, green))
-
-                color = Color(
-                    red=numpy.clip(red, 0, 1),
-                    green=numpy.clip(green, 0, 1),
-                    blue=numpy.clip(blue, 0, 1),
-                )
-
-                self.scene.send(SetGroupColor(
-                    group=self.scene.get_group(),
-                    color=color))
-            case HeadGyro():
-                min_dps = 0.0
-                max_dps = 200.0
-
-                def norm(val: float) -> float:
-                    return ((abs(val) - min_dps) / (max_dps - min_dps)) ** 2
-
-                for sample in msg.x:
-                    red = self.filter_red(norm(sample))
-                for sample in msg.y:
-                    green = self.filter_green(norm(sample))
-                for sample in msg.z:
-                    blue = self.filter_blue(norm(sample))
-
-                color = Color(
-                    red=numpy.clip(red, 0, 1),
-                    green=numpy.clip(green, 0, 1),
-                    blue=numpy.clip(blue, 0, 1),
-                )
-
-                self.scene.send(SetGroupColor(
-                    group=self.scene.get_group(),
-                    color=color))
-            case BrainWaves():
-                # min_db = 30
-                # max_db = 60
-                if self.last_bw_ts is None or msg.timestamp - self.last_bw_ts > 0.05:
-                    self.last_bw_ts = msg.timestamp
-                    bwmin = min((msg.alpha, msg.beta, msg.theta))
-                    bwmax = max((msg.alpha, msg.beta, msg.theta))
-                    color = Color(
-                        red=numpy.clip((msg.alpha - bwmin) / (bwmax - bwmin), 0, 1),
-                        green=numpy.clip((msg.beta - bwmin) / (bwmax - bwmin), 0, 1),
-                        blue=numpy.clip((msg.theta - bwmin) / (bwmax - bwmin), 0, 1),
-                    )
-                    self.scene.send(SetGroupColor(
-                        group=self.scene.get_group(),
-                        color=color))
-            case _:
-                super().on_message(msg)
+        if (handler := self.handlers.get(type(msg))) is not None:
+            handler(msg)
+        else:
+            super().on_message(msg)
+
+    def on_head_yes_no(self, msg: HeadYesNo):
+        value = msg.intensity ** 2
+
+        red = 0
+        green = 0
+        blue = 0
+
+        match msg.gesture:
+            case "meh":
+                # Meh
+                red = value
+                green = value / 3
+            case "yes":
+                # Yes
+                green = value
+            case "no":
+                # No
+                red = value
+
+        red = self.filter_red(red)
+        green = self.filter_green(green)
+        blue = self.filter_blue(blue)
+
+        color = Color(
+            red=numpy.clip(red, 0, 1),
+            green=numpy.clip(green, 0, 1),
+            blue=numpy.clip(blue, 0, 1),
+        )
+
+        self.scene.send_color(color)
+
+    def on_head_moved(self, msg: HeadMoved):
+        def norm(val: float, min_angle=0, max_angle=80) -> float:
+            return ((abs(val) - min_angle) / (max_angle - min_angle)) ** 2
+
+        blue = self.filter_blue(norm(msg.pitch, max_angle=40))
+        green = self.filter_green(norm(msg.roll, max_angle=40))
+        red = self.filter_red(1 - max(blue, green))
+
+        color = Color(
+            red=numpy.clip(red, 0, 1),
+            green=numpy.clip(green, 0, 1),
+            blue=numpy.clip(blue, 0, 1),
+        )
+
+        self.scene.send_color(color)
+
+    def on_head_gyro(self, msg: HeadGyro):
+        min_dps = 0.0
+        max_dps = 200.0
+
+        def norm(val: float) -> float:
+            return ((abs(val) - min_dps) / (max_dps - min_dps)) ** 2
+
+        # Bind the filters to locals, since they are called for every sample
+        filter_red = self.filter_red
+        filter_green = self.filter_green
+        filter_blue = self.filter_blue
+        for sample in msg.x:
+            red = filter_red(norm(sample))
+        for sample in msg.y:
+            green = filter_green(norm(sample))
+        for sample in msg.z:
+            blue = filter_blue(norm(sample))
+
+        color = Color(
+            red=numpy.clip(red, 0, 1),
+            green=numpy.clip(green, 0, 1),
+            blue=numpy.clip(blue, 0, 1),
+        )
+
+        self.scene.send_color(color)
+
+    def on_brain_waves(self, msg: BrainWaves):
+        # min_db = 30
+        # max_db = 60
+        if self.last_bw_ts is None or msg.timestamp - self.last_bw_ts > 0.05:
+            self.last_bw_ts = msg.timestamp
+            bwmin = min((msg.alpha, msg.beta, msg.theta))
+            bwmax = max((msg.alpha, msg.beta, msg.theta))
+            color = Color(
+                red=numpy.clip((msg.alpha - bwmin) / (bwmax - bwmin), 0, 1),
+                green=numpy.clip((msg.beta - bwmin) / (bwmax - bwmin), 0, 1),
+                blue=numpy.clip((msg.theta - bwmin) / (bwmax - bwmin), 0, 1),
+            )
+            self.scene.send_color(color)
 
 
 @register
@@ -356,6 +420,9 @@ class ColorDance(ModeComponent, SingleGroupScene):
         for info in self.list_modes():
             self.modes.append([info.name, info.summary])
 
+        # Last group and color sent, to avoid sending the same color again
+        self.last_color: tuple[int, Color] | None = None
+
     @export
     def set_mode(self, name: str) -> None:
         """
@@ -373,9 +440,19 @@ class ColorDance(ModeComponent, SingleGroupScene):
     @check_hub
     def set_active(self, value: bool):
         super().set_active(value)
-        self.send(SetGroupColor(
-            group=self.get_group(),
-            color=Color(0, 0, 0)))
+        # Always reset the color, which other components may have changed
+        self.last_color = None
+        self.send_color(Color(0, 0, 0))
+
+    def send_color(self, color: Color):
+        """
+        Set the color of the group, if it changed
+        """
+        group = self.get_group()
+        if (group, color) == self.last_color:
+            return
+        self.last_color = (group, color)
+        self.send(SetGroupColor(group=group, color=color))
 
     @check_hub
     def receive(self, msg: Message):
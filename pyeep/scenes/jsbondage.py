@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pyeep.component.base import check_hub
+from pyeep.gtk import GLib
 from ..messages.message import Message
 
 from ..inputs.joystick import JoystickAxisMoved
@@ -17,6 +18,19 @@ class JSBondage(SingleGroupPowerScene):
         # self.axes: dict[int, Axis] = {}
         self.timeout: int | None = None
         self.last_delta: dict[int, float] = {4: 0.0, 5: 0.0}
+        # Idle callback sending the power computed from the latest axis
+        # values, so that bursts of joystick events send only one message
+        self.power_flush: int | None = None
+        self.last_power: float | None = None
+
+    @check_hub
+    def set_active(self, value: bool):
+        # Other components may have changed the power in the meantime
+        self.last_power = None
+        if not value and self.power_flush is not None:
+            GLib.source_remove(self.power_flush)
+            self.power_flush = None
+        super().set_active(value)
 
     @check_hub
     def receive(self, msg: Message):
@@ -26,6 +40,15 @@ class JSBondage(SingleGroupPowerScene):
         match msg:
             case JoystickAxisMoved():
                 self.last_delta[msg.axis] = abs(msg.value)
+                if self.power_flush is None:
+                    self.power_flush = GLib.idle_add(self._send_power)
 
-                power = (sum(self.last_delta.values()) / 2)  # ** 2
-                self.send(SetGroupPower(group=1, power=power))
+    def _send_power(self):
+        self.power_flush = None
+        if not self.is_active:
+            return False
+        power = (sum(self.last_delta.values()) / 2)  # ** 2
+        if power != self.last_power:
+            self.last_power = power
+            self.send(SetGroupPower(group=1, power=power))
+        return False
@@ -49,7 +49,6 @@ class Random(Scene):
 
         return expander
 
-    @check_hub
     def do_something(self):
         group = random.randint(0, self.OUTPUTS)
         dice_roll = random.randint(0, 10)
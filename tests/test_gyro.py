@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+    from pyeep.muse2 import GyroAxisBase
+except ImportError as e:
+    raise unittest.SkipTest(f"muse2 dependencies not available: {e}")
+
+
+class RecordingAxis(GyroAxisBase):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.processed: list[tuple[float, float]] = []
+
+    def process_sample(self, timestamp: float, sample: float):
+        self.processed.append((timestamp, sample))
+
+
+class TestGyroCalibration(unittest.TestCase):
+    def setUp(self):
+        # The calibration file is written to the current directory
+        self.orig_cwd = os.getcwd()
+        self.workdir = tempfile.TemporaryDirectory()
+        os.chdir(self.workdir.name)
+
+    def tearDown(self):
+        os.chdir(self.orig_cwd)
+        self.workdir.cleanup()
+
+    def test_batches_straddling_calibration(self):
+        rng = numpy.random.default_rng(42)
+        samples = rng.normal(3.0, 1.0, 400)
+        timestamps = [i / 52 for i in range(400)]
+
+        axis = RecordingAxis("test")
+        # Batches of 100 samples: the third one straddles the 256 boundary
+        for start in range(0, 400, 100):
+            axis.add_samples(timestamps[start:start + 100], samples[start:start + 100])
+
+        bias = numpy.mean(samples[:256])
+        self.assertAlmostEqual(axis.bias, bias)
+
+        with open(".cal_gyro_test") as fd:
+            self.assertAlmostEqual(json.load(fd)["bias"], bias)
+
+        # Only the samples after calibration are processed, once each
+        self.assertEqual([ts for ts, _ in axis.processed], timestamps[256:])
+        numpy.testing.assert_allclose(
+                [sample for _, sample in axis.processed], samples[256:] - bias)
+
+    def test_calibration_ends_on_batch_boundary(self):
+        samples = numpy.arange(300, dtype=float)
+        timestamps = [float(i) for i in range(300)]
+
+        axis = RecordingAxis("test")
+        axis.add_samples(timestamps[:256], samples[:256])
+        self.assertAlmostEqual(axis.bias, numpy.mean(samples[:256]))
+        self.assertEqual(axis.processed, [])
+
+        axis.add_samples(timestamps[256:], samples[256:])
+        self.assertEqual([ts for ts, _ in axis.processed], timestamps[256:])
+
+    def test_load_calibration(self):
+        with open(".cal_gyro_test", "w") as fd:
+            json.dump({"bias": 1.5}, fd)
+
+        axis = RecordingAxis("test")
+        axis.add_samples([0.0, 1.0], numpy.array([2.0, 3.0]))
+        self.assertEqual(axis.processed, [(0.0, 0.5), (1.0, 1.5)])
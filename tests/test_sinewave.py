@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import unittest
+
+try:
+    import numpy
+    from pyeep.outputs.pattern import TableSineWave
+except ImportError as e:
+    raise unittest.SkipTest(f"pattern output dependencies not available: {e}")
+
+RATE = 48000
+# Linear interpolation on the table is accurate to well under this
+TOLERANCE = 1e-5
+
+
+def reference(freq: float, start: int, frames: int) -> numpy.ndarray:
+    return numpy.sin(2 * numpy.pi * freq * numpy.arange(start, start + frames) / RATE)
+
+
+class TestTableSineWave(unittest.TestCase):
+    def test_wave(self):
+        for freq in (1.0, 50.0, 440.0, 1000.0, 4321.5):
+            with self.subTest(freq=freq):
+                wave = TableSineWave(RATE, 1024)
+                array = numpy.empty(1024, dtype=numpy.float32)
+                wave.wave(array, freq)
+                numpy.testing.assert_allclose(array, reference(freq, 0, 1024), atol=TOLERANCE)
+
+    def test_phase_continuity(self):
+        freq = 440.0
+        wave = TableSineWave(RATE, 1024)
+        first = numpy.empty(300, dtype=numpy.float32)
+        second = numpy.empty(724, dtype=numpy.float32)
+        wave.wave(first, freq)
+        wave.wave(second, freq)
+        numpy.testing.assert_allclose(
+                numpy.concatenate((first, second)), reference(freq, 0, 1024), atol=TOLERANCE)
+
+    def test_grow_buffers(self):
+        freq = 1000.0
+        wave = TableSineWave(RATE, 256)
+        small = numpy.empty(256, dtype=numpy.float32)
+        large = numpy.empty(2048, dtype=numpy.float32)
+        wave.wave(small, freq)
+        wave.wave(large, freq)
+        self.assertGreaterEqual(len(wave.ramp), 2048)
+        numpy.testing.assert_allclose(small, reference(freq, 0, 256), atol=TOLERANCE)
+        numpy.testing.assert_allclose(large, reference(freq, 256, 2048), atol=TOLERANCE)
+
+        # Grown buffers keep working for smaller blocks
+        wave.wave(small, freq)
+        numpy.testing.assert_allclose(small, reference(freq, 2304, 256), atol=TOLERANCE)
+
+    def test_synth(self):
+        freq = 440.0
+        wave = TableSineWave(RATE)
+        envelope = numpy.linspace(0, 1, 512, dtype=numpy.float32)
+        array = numpy.empty(512, dtype=numpy.float32)
+        wave.synth(array, freq, envelope)
+        numpy.testing.assert_allclose(array, reference(freq, 0, 512) * envelope, atol=TOLERANCE)